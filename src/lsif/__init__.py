@@ -1,20 +1,29 @@
-import abc
-import dataclasses
-import json
-from functools import cached_property
+import array
+import itertools
+import multiprocessing
+import os
+import sys
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import partial
 from pathlib import Path
 from typing import Any
 from typing import Dict
-from typing import Generator
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Tuple
 
-from jedi.api import Script
+import orjson
 from jedi.api.classes import Name
 
+from lsif.cache import AnalysisCache
+from lsif.cache import hash_file
 from lsif.padawan import Definition
-from lsif.padawan import Reference
+from lsif.padawan import FileAnalysis
+from lsif.padawan import analyze_file
 from lsif.types import Range
 from lsif.types import Writer
 
@@ -24,98 +33,127 @@ __version__ = "0.1.0"
 # THREAD
 IGNORE_ID = -1
 
+# Number of serialized lines to buffer before handing them to the writer
+FLUSH_THRESHOLD = 512
 
-def _get_next_id() -> Generator[int, None, None]:
-    count = 1
-    while True:
-        yield count
-        count += 1
+# Where the command line keeps jedi results between runs when asked to (see AnalysisCache)
+CACHE_PATH = Path(".lsif-cache.sqlite")
 
 
-class BaseNode(abc.ABC):
-    __id_generator = _get_next_id()
+class BaseNode:
+    """Base of every vertex and edge.
+
+    Subclasses set type, label and _fields as plain class attributes and list their
+    instance attributes in __slots__, so nodes carry no per-instance __dict__.
+    """
+
+    __slots__ = ("id",)
+
+    __id_generator = itertools.count(1).__next__
     id: int
 
+    type: str
+    label: str
+
     _base_fields: Tuple[str, ...] = ("label", "type", "id")
+    _fields: Tuple[str, ...]
 
-    @property
-    @abc.abstractmethod
-    def type(self) -> str:
-        raise NotImplementedError
+    # Computed once per class from _base_fields + _fields
+    _ALL_FIELDS: Tuple[str, ...]
 
-    @property
-    @abc.abstractmethod
-    def label(self) -> str:
-        raise NotImplementedError
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
 
-    @property
-    @abc.abstractmethod
-    def _fields(self) -> Tuple[str, ...]:
-        raise NotImplementedError
+        # Intermediate bases don't define _fields; dict.fromkeys drops repeats like ProjectNode's "label"
+        cls._ALL_FIELDS = tuple(dict.fromkeys(cls._base_fields + getattr(cls, "_fields", ())))
 
     def __init__(self, id: Optional[int] = None) -> None:
-        self.id = id or next(self.__id_generator)
+        self.id = id if id is not None else BaseNode.__id_generator()
 
-    def to_dictionary(self) -> Dict[str, Any]:
-        fields = list(self._base_fields + self._fields)
+    @staticmethod
+    def next_id() -> int:
+        """Allocate an id for a node that is serialized without being created (see emit)."""
+        return BaseNode.__id_generator()
 
-        # Can pass IGNORE_ID to not serialize ID
-        #   Thus far, only metadata needs this.
-        if self.id == IGNORE_ID:
-            fields.remove("id")
-
-        return {field: getattr(self, field) for field in fields}
+    def to_dictionary(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self._ALL_FIELDS}
 
-    def serialize(self) -> str:
-        return json.dumps(self.to_dictionary()) + "\n"
+    def serialize(self) -> bytes:
+        return orjson.dumps(self.to_dictionary()) + b"\n"
 
 
 class EdgeBase(BaseNode):
+    __slots__ = ()
+
     type = "edge"
 
     def __init__(self) -> None:
         super().__init__()
 
 
-class NextNode(EdgeBase):
-    label = "next"
+class SingleEdgeBase(EdgeBase):
+    __slots__ = ("inV", "outV")
 
     inV: int
     outV: int
 
     _fields = ("inV", "outV")
 
+    _TEMPLATE: bytes
+
     def __init__(self, inV: int, outV: int) -> None:
         super().__init__()
         self.inV = inV
         self.outV = outV
 
+    @classmethod
+    def _format(cls, id: int, inV: int, outV: int) -> bytes:
+        return cls._TEMPLATE % (id, inV, outV)
 
-class SingleEdgeBase(EdgeBase):
-    inV: int
-    outV: int
+    def serialize(self) -> bytes:
+        return self._format(self.id, self.inV, self.outV)
 
-    _fields = ("inV", "outV")
+    @classmethod
+    def emit(cls, inV: int, outV: int) -> bytes:
+        """Serialize a new edge directly, without allocating a node for it."""
+        return cls._format(cls.next_id(), inV, outV)
 
-    def __init__(self, inV: int, outV: int) -> None:
-        super().__init__()
-        self.inV = inV
-        self.outV = outV
+
+class NextNode(SingleEdgeBase):
+    __slots__ = ()
+
+    label = "next"
+
+    _TEMPLATE = b'{"id":%d,"type":"edge","label":"next","inV":%d,"outV":%d}\n'
 
 
 class TextDocumentHoverNode(SingleEdgeBase):
+    __slots__ = ()
+
     label = "textDocument/hover"
 
+    _TEMPLATE = b'{"id":%d,"type":"edge","label":"textDocument/hover","inV":%d,"outV":%d}\n'
+
 
 class TextDocumentDefinitionNode(SingleEdgeBase):
+    __slots__ = ()
+
     label = "textDocument/definition"
 
+    _TEMPLATE = b'{"id":%d,"type":"edge","label":"textDocument/definition","inV":%d,"outV":%d}\n'
+
 
 class TextDocumentReferenceNode(SingleEdgeBase):
+    __slots__ = ()
+
     label = "textDocument/references"
 
+    _TEMPLATE = b'{"id":%d,"type":"edge","label":"textDocument/references","inV":%d,"outV":%d}\n'
+
 
 class MultiEdgeBase(EdgeBase):
+    __slots__ = ("inVs", "outV")
+
     inVs: List[int]
     outV: int
 
@@ -128,22 +166,48 @@ class MultiEdgeBase(EdgeBase):
 
 
 class ItemNode(MultiEdgeBase):
+    __slots__ = ("document",)
+
     label = "item"
     document: int
 
     _fields = ("document", *MultiEdgeBase._fields)
 
+    _TEMPLATE = b'{"id":%d,"type":"edge","label":"item","document":%d,"inVs":%b,"outV":%d}\n'
+
     def __init__(self, document: "DocumentNode", *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
 
         self.document = document.id
 
+    @classmethod
+    def _format(cls, id: int, document: int, inVs: List[int], outV: int) -> bytes:
+        return cls._TEMPLATE % (id, document, orjson.dumps(inVs), outV)
+
+    def serialize(self) -> bytes:
+        return self._format(self.id, self.document, self.inVs, self.outV)
+
+    @classmethod
+    def emit(cls, document: "DocumentNode", inVs: List[int], outV: int) -> bytes:
+        return cls._format(cls.next_id(), document.id, inVs, outV)
+
 
 class ContainsNode(MultiEdgeBase):
+    __slots__ = ()
+
     label = "contains"
 
+    # inVs can hold every range of a document (or every document of the project). orjson
+    #   encodes int lists in C, measurably faster than building the array with str.join.
+    _TEMPLATE = b'{"id":%d,"type":"edge","label":"contains","inVs":%b,"outV":%d}\n'
+
+    def serialize(self) -> bytes:
+        return self._TEMPLATE % (self.id, orjson.dumps(self.inVs), self.outV)
+
 
 class VertexBase(BaseNode):
+    __slots__ = ()
+
     type = "vertex"
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -153,8 +217,12 @@ class VertexBase(BaseNode):
 class MetadataNode(VertexBase):
     """Node for metadata stuff"""
 
+    __slots__ = ("projectRoot",)
+
     label = "metaData"
 
+    # Metadata is the one vertex serialized without an id
+    _base_fields = ("label", "type")
     _fields = ("version", "positionEncoding", "projectRoot")
 
     """ The version of the LSIF format using semver notation. See https://semver.org/. Please note
@@ -169,17 +237,29 @@ class MetadataNode(VertexBase):
     """ The project root (in form of an URI) used to compute this dump."""
     projectRoot: str
 
+    _TEMPLATE = b'{"type":"vertex","label":"metaData","version":"0.5.0","positionEncoding":"utf-16","projectRoot":%b}\n'
+
     def __init__(self, projectRoot: Path) -> None:
         super().__init__(id=IGNORE_ID)
         self.projectRoot = projectRoot.absolute().as_uri()
 
+    def serialize(self) -> bytes:
+        return self._TEMPLATE % orjson.dumps(self.projectRoot)
+
 
 class ProjectNode(VertexBase):
+    __slots__ = ()
+
     label = "project"
     kind = "python"
 
     _fields = ("label", "kind")
 
+    _TEMPLATE = b'{"id":%d,"type":"vertex","label":"project","kind":"python"}\n'
+
+    def serialize(self) -> bytes:
+        return self._TEMPLATE % self.id
+
 
 class DocumentNode(VertexBase):
     """{
@@ -191,6 +271,8 @@ class DocumentNode(VertexBase):
     }
     """
 
+    __slots__ = ("uri", "path")
+
     label = "document"
     languageId: str = "python"
 
@@ -199,43 +281,65 @@ class DocumentNode(VertexBase):
     uri: str
     path: Path
 
+    _TEMPLATE = b'{"id":%d,"type":"vertex","label":"document","languageId":"python","uri":%b}\n'
+
     def __init__(self, path: Path) -> None:
         super().__init__()
         self.path = path.absolute()
         self.uri = self.path.as_uri()
 
-    @cached_property
-    def script(self) -> Script:
-        return Script(path=str(self.path))
+    def serialize(self) -> bytes:
+        return self._TEMPLATE % (self.id, orjson.dumps(self.uri))
 
 
 class ResultSetNode(VertexBase):
+    __slots__ = ()
+
     label = "resultSet"
     _fields = tuple()
 
+    _TEMPLATE = b'{"id":%d,"type":"vertex","label":"resultSet"}\n'
+
     def __init__(self) -> None:
         super().__init__()
 
+    def serialize(self) -> bytes:
+        return self._TEMPLATE % self.id
+
 
 class RangeNode(VertexBase):
+    __slots__ = ("_range", "_document")
+
     label = "range"
     _fields = ("start", "end", "document")
 
     _range: Range
     _document: DocumentNode
 
+    _TEMPLATE = (
+        b'{"id":%d,"type":"vertex","label":"range",'
+        b'"start":{"line":%d,"character":%d},"end":{"line":%d,"character":%d},"document":%d}\n'
+    )
+
     def __init__(self, range: Range, document: DocumentNode) -> None:
         super().__init__()
         self._range = range
         self._document = document
 
+    def serialize(self) -> bytes:
+        start = self._range.start
+        end = self._range.end
+        return self._TEMPLATE % (self.id, start.line, start.character, end.line, end.character, self._document.id)
+
     @property
     def start(self) -> Dict:
-        return dataclasses.asdict(self._range.start)
+        start = self._range.start
+        return {"line": start.line, "character": start.character}
 
     @property
     def end(self) -> Dict:
-        return dataclasses.asdict(self._range.end)
+        end = self._range.end
+        return {"line": end.line, "character": end.character}
 
     @property
     def document(self) -> int:
@@ -243,25 +347,111 @@ class RangeNode(VertexBase):
 
 
 class HoverResult(VertexBase):
+    __slots__ = ("result",)
+
     label = "hoverResult"
     result: Dict
 
     _fields = ("result",)
 
+    _TEMPLATE = b'{"id":%d,"type":"vertex","label":"hoverResult","result":%b}\n'
+
     def __init__(self, definition: Definition) -> None:
         super().__init__()
         self.result = {"contents": [definition.docstring]}
 
+    def serialize(self) -> bytes:
+        return self._TEMPLATE % (self.id, orjson.dumps(self.result))
+
 
 class DefinitionResult(VertexBase):
+    __slots__ = ()
+
     label = "definitionResult"
     _fields = tuple()
 
+    _TEMPLATE = b'{"id":%d,"type":"vertex","label":"definitionResult"}\n'
+
+    def serialize(self) -> bytes:
+        return self._TEMPLATE % self.id
+
 
 class ReferenceResult(VertexBase):
+    __slots__ = ()
+
     label = "referenceResult"
     _fields = tuple()
 
+    _TEMPLATE = b'{"id":%d,"type":"vertex","label":"referenceResult"}\n'
+
+    def serialize(self) -> bytes:
+        return self._TEMPLATE % self.id
+
+
+def _walk_py(root: str) -> Iterator[str]:
+    """Yield the path of every python file below root.
+
+    Uses os.scandir directly, so the file type comes from the cached directory entry
+    instead of a stat() per path.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    yield entry.path
+
+
+def _run_analyses(files: List[str], project_path: Path, jobs: Optional[int]) -> Iterator[FileAnalysis]:
+    """Run jedi over every file, yielding the results in the order of files.
+
+    jobs is the number of worker processes (None for one per cpu). With jobs=1 everything
+    runs in this process, but the next file is analyzed on a background thread while the
+    caller emits the current one.
+    """
+    analyze = partial(analyze_file, project_root=str(project_path))
+
+    if jobs == 1:
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending: Optional[Future] = None
+            for file in files:
+                upcoming = prefetcher.submit(analyze, file)
+                if pending is not None:
+                    yield pending.result()
+                pending = upcoming
+
+            if pending is not None:
+                yield pending.result()
+        return
+
+    # Spawned rather than forked: a forked worker inherits jedi's environment and its compiled
+    #   subprocess connection from this process, which breaks once jedi has run here before
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn")) as executor:
+        yield from executor.map(analyze, files, chunksize=4)
+
+
+def _iter_analyses(
+    files: List[str], project_path: Path, jobs: Optional[int], cache: Optional[AnalysisCache]
+) -> Iterator[FileAnalysis]:
+    """Yield the analysis of every file in order, only running jedi for files the cache misses."""
+    if cache is None:
+        yield from _run_analyses(files, project_path, jobs)
+        return
+
+    digests = [hash_file(file) for file in files]
+    cached = [cache.get(file, digest) for file, digest in zip(files, digests)]
+
+    missed_files = [file for file, analysis in zip(files, cached) if analysis is None]
+    with closing(_run_analyses(missed_files, project_path, jobs)) as missed:
+        for digest, analysis in zip(digests, cached):
+            if analysis is None:
+                analysis = next(missed)
+                cache.put(digest, analysis)
+
+            yield analysis
+
 
 _ = """
 // The document
@@ -274,121 +464,150 @@ _ = """
 """
 
 
-def index(project_path: Path, writer: Writer) -> None:
+def index(project_path: Path, writer: Writer, jobs: Optional[int] = None, cache_path: Optional[Path] = None) -> None:
+    # Serialized lines are collected here and handed to the writer in chunks
+    buf: List[bytes] = []
+
+    def flush() -> None:
+        writer.write(b"".join(buf))
+        buf.clear()
+
+    # Resolve against the working directory once; every path walked below is already absolute
+    project_path = project_path.absolute()
+
     mt = MetadataNode(project_path)
-    writer.write(mt.serialize())
+    buf.append(mt.serialize())
 
     project_node = ProjectNode()
-    writer.write(project_node.serialize())
+    buf.append(project_node.serialize())
 
     names_to_result_sets: Dict[str, ResultSetNode] = {}
+    # Identical docstrings share a single hover result vertex
+    docstring_to_hover_result: Dict[str, HoverResult] = {}
     module_path_to_document_node: Dict[str, DocumentNode] = {}
 
     document_ids: List[int] = []
 
-    for file in project_path.glob("**/*.py"):
-        # TODO: Keep track of the ranges to associate them with this document
-        print("Parsing:", file)
+    # Jedi does the heavy lifting in worker processes. Nodes (and so IDs) are only created
+    #   here, one file at a time in walk order, which keeps the output deterministic.
+    files = list(_walk_py(str(project_path)))
+    cache = AnalysisCache(cache_path, project_path) if cache_path is not None else None
+    try:
+        for analysis in _iter_analyses(files, project_path, jobs, cache):
+            # TODO: Keep track of the ranges to associate them with this document
+            print("Parsing:", analysis.path)
+
+            # Names and paths arrive as fresh strings from the workers; interning them keeps the
+            #   dictionary keys below shared with every later lookup
+            abs_path = sys.intern(analysis.path)
+            document_node = module_path_to_document_node.get(abs_path)
+            if document_node is None:
+                document_node = DocumentNode(Path(abs_path))
+                buf.append(document_node.serialize())
+                module_path_to_document_node[abs_path] = document_node
 
-        filepath = Path(file)
-        abs_path = str(filepath.absolute())
-        document_node = module_path_to_document_node.get(abs_path, None)
-        if not document_node:
-            document_node = DocumentNode(filepath)
-            writer.write(document_node.serialize())
+            document_ids.append(document_node.id)
 
-        document_ids.append(document_node.id)
-        module_path_to_document_node[str(document_node.script.path.absolute())] = document_node
+            # Only the IDs of the ranges are needed for the contains edge
+            contained_range_ids = array.array("q")
 
-        contained_ranges: List[RangeNode] = []
+            for definition in analysis.definitions:
+                if len(buf) >= FLUSH_THRESHOLD:
+                    flush()
 
-        # I think this is always empty
-        # names = document.script.get_names(all_scopes=True, definitions=False, references=False)
-        # print(names)
+                result_set = ResultSetNode()
 
-        definitions = document_node.script.get_names(all_scopes=True, definitions=True, references=False)
-        for jedi_def in definitions:
-            result_set = ResultSetNode()
+                def_name = sys.intern(definition.name)
+                print(def_name)
+                assert def_name, f"Missing name for: {definition}"
 
-            def_name = jedi_def.full_name or jedi_def.name
-            print(def_name)
-            assert def_name, f"Missing name for: {jedi_def}"
+                names_to_result_sets[def_name] = result_set
 
-            names_to_result_sets[def_name] = result_set
+                definition_node = RangeNode(range=definition.range, document=document_node)
 
-            definition = Definition(jedi_def)
-            definition_node = RangeNode(range=definition.range, document=document_node)
+                contained_range_ids.append(definition_node.id)
 
-            contained_ranges.append(definition_node)
+                buf.append(result_set.serialize())
+                buf.append(definition_node.serialize())
 
-            writer.write(result_set.serialize())
-            writer.write(definition_node.serialize())
+                # Edges are never looked up again, so they are serialized straight from their ids
+                buf.append(NextNode.emit(inV=result_set.id, outV=definition_node.id))
 
-            definition_next_node = NextNode(inV=result_set.id, outV=definition_node.id)
-            writer.write(definition_next_node.serialize())
+                hover_node = docstring_to_hover_result.get(definition.docstring)
+                if hover_node is None:
+                    hover_node = HoverResult(definition=definition)
+                    buf.append(hover_node.serialize())
+                    docstring_to_hover_result[definition.docstring] = hover_node
 
-            hover_node = HoverResult(definition=definition)
-            writer.write(hover_node.serialize())
+                buf.append(TextDocumentHoverNode.emit(inV=hover_node.id, outV=result_set.id))
 
-            writer.write(TextDocumentHoverNode(inV=hover_node.id, outV=result_set.id).serialize())
+                definition_result_node = DefinitionResult()
+                buf.append(definition_result_node.serialize())
 
-            definition_result_node = DefinitionResult()
-            writer.write(definition_result_node.serialize())
+                buf.append(TextDocumentDefinitionNode.emit(inV=definition_result_node.id, outV=result_set.id))
+                buf.append(
+                    ItemNode.emit(inVs=[definition_node.id], outV=definition_result_node.id, document=document_node)
+                )
 
-            writer.write(TextDocumentDefinitionNode(inV=definition_result_node.id, outV=result_set.id).serialize())
-            writer.write(
-                ItemNode(inVs=[definition_node.id], outV=definition_result_node.id, document=document_node).serialize()
-            )
+            for reference in analysis.references:
+                if len(buf) >= FLUSH_THRESHOLD:
+                    flush()
 
-        references = document_node.script.get_names(all_scopes=True, definitions=False, references=True)
-        for jedi_ref in references:
-            reference = Reference(jedi_ref)
-            reference_node = RangeNode(range=reference.range, document=document_node)
-            contained_ranges.append(reference_node)
+                reference_node = RangeNode(range=reference.range, document=document_node)
+                contained_range_ids.append(reference_node.id)
 
-            writer.write(reference_node.serialize())
+                buf.append(reference_node.serialize())
 
-            possible_definitions = jedi_ref.goto(follow_imports=True)
-            if not possible_definitions:
-                print("No definitions found:", jedi_ref)
-                continue
+                if reference.target is None:
+                    print("No definitions found:", reference)
+                    continue
 
-            jedi_reference_def = possible_definitions[0]
-            if jedi_reference_def.full_name not in names_to_result_sets:
-                print("SKIPPING:", jedi_reference_def, jedi_reference_def.module_name)
-                continue
+                jedi_reference_def_name = sys.intern(reference.target)
 
-            jedi_reference_def_name = jedi_reference_def.full_name
-            assert jedi_reference_def_name
-            jedi_reference_def_result_set = names_to_result_sets[jedi_reference_def_name]
+                if jedi_reference_def_name not in names_to_result_sets:
+                    print("SKIPPING:", jedi_reference_def_name)
+                    continue
 
-            writer.write(NextNode(inV=jedi_reference_def_result_set.id, outV=reference_node.id).serialize())
+                jedi_reference_def_result_set = names_to_result_sets[jedi_reference_def_name]
 
-            reference_result_node = ReferenceResult()
-            writer.write(reference_result_node.serialize())
+                buf.append(NextNode.emit(inV=jedi_reference_def_result_set.id, outV=reference_node.id))
 
-            writer.write(
-                TextDocumentReferenceNode(
-                    inV=reference_result_node.id, outV=jedi_reference_def_result_set.id
-                ).serialize()
-            )
+                reference_result_node = ReferenceResult()
+                buf.append(reference_result_node.serialize())
 
-            writer.write(
-                ItemNode(inVs=[reference_node.id], outV=reference_result_node.id, document=document_node).serialize()
-            )
+                buf.append(
+                    TextDocumentReferenceNode.emit(inV=reference_result_node.id, outV=jedi_reference_def_result_set.id)
+                )
+                buf.append(
+                    ItemNode.emit(inVs=[reference_node.id], outV=reference_result_node.id, document=document_node)
+                )
 
-            # I make this edge earlier maybe? otherwise feels like you keep a ton of stuff in memory for lookups...
-            # writer.write(
-            #     ItemNode(inVs=[jedi_reference_def.id], outV=reference_result_node.id, document=document_node).serialize()
-            # )
+                # I make this edge earlier maybe? otherwise feels like you keep a ton of stuff in memory for lookups...
+                # writer.write(
+                #     ItemNode(
+                #         inVs=[jedi_reference_def.id], outV=reference_result_node.id, document=document_node
+                #     ).serialize()
+                # )
 
-        writer.write(ContainsNode(inVs=[x.id for x in contained_ranges], outV=document_node.id).serialize())
+            buf.append(ContainsNode(inVs=contained_range_ids.tolist(), outV=document_node.id).serialize())
+    except BaseException:
+        # Only committed once the whole project went through, a failed run leaves the cache as it was
+        if cache is not None:
+            cache.rollback()
+        raise
+    else:
+        if cache is not None:
+            cache.commit()
+    finally:
+        if cache is not None:
+            cache.close()
 
     print("module paths:", module_path_to_document_node)
     print("definition names:", names_to_result_sets)
-    writer.write(ContainsNode(inVs=document_ids, outV=project_node.id).serialize())
+    buf.append(ContainsNode(inVs=document_ids, outV=project_node.id).serialize())
+    flush()
 
 
-def index_to_file(project_root: Path) -> None:
-    with open("dump.lsif", "w") as writer:
-        index(project_root, writer)
+def index_to_file(project_root: Path, jobs: Optional[int] = None, cache_path: Optional[Path] = None) -> None:
+    with open("dump.lsif", "wb", buffering=1 << 20) as writer:
+        index(project_root, writer, jobs=jobs, cache_path=cache_path)
@@ -1,6 +1,7 @@
 import argparse
 from pathlib import Path
 
+from lsif import CACHE_PATH
 from lsif import index_to_file
 
 # index_to_file(Path("./tests/examples/lsif_spec_definition/"))
@@ -8,7 +9,15 @@ from lsif import index_to_file
 
 parser = argparse.ArgumentParser(description="LSIF Python Indexer")
 parser.add_argument("-p", "--project", type=str, help="Path to project", default="./tests/examples/beta_two_files/")
+parser.add_argument("-j", "--jobs", type=int, help="Number of worker processes (defaults to one per cpu)", default=None)
+parser.add_argument(
+    "--cache",
+    action="store_true",
+    help=f"Reuse jedi results for unchanged files from {CACHE_PATH} (may miss changes that come from other files)",
+)
 
-args = parser.parse_args()
+# Guarded so worker processes that re-import this module don't start indexing themselves
+if __name__ == "__main__":
+    args = parser.parse_args()
 
-index_to_file(Path(args.project))
+    index_to_file(Path(args.project), jobs=args.jobs, cache_path=CACHE_PATH if args.cache else None)
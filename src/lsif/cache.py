@@ -0,0 +1,123 @@
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Optional
+
+import jedi
+import orjson
+
+from lsif.padawan import Definition
+from lsif.padawan import FileAnalysis
+from lsif.padawan import Reference
+from lsif.types import Position
+from lsif.types import Range
+
+# Stored in PRAGMA user_version; a file with any other version is emptied on open
+_SCHEMA_VERSION = 1
+
+
+def hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _encode_range(range: Range) -> List[int]:
+    return [range.start.line, range.start.character, range.end.line, range.end.character]
+
+
+def _decode_range(values: List[int]) -> Range:
+    start_line, start_character, end_line, end_character = values
+    return Range(
+        start=Position(line=start_line, character=start_character),
+        end=Position(line=end_line, character=end_character),
+    )
+
+
+def _encode(analysis: FileAnalysis) -> bytes:
+    return orjson.dumps(
+        {
+            "definitions": [
+                [definition.name, _encode_range(definition.range), definition.docstring]
+                for definition in analysis.definitions
+            ],
+            "references": [[_encode_range(reference.range), reference.target] for reference in analysis.references],
+        }
+    )
+
+
+def _decode(path: str, blob: bytes) -> FileAnalysis:
+    data: Any = orjson.loads(blob)
+
+    return FileAnalysis(
+        path=path,
+        definitions=[
+            Definition(name=str(name), range=_decode_range(span), docstring=str(docstring))
+            for name, span, docstring in data["definitions"]
+        ],
+        references=[
+            Reference(range=_decode_range(span), target=None if target is None else str(target))
+            for span, target in data["references"]
+        ],
+    )
+
+
+class AnalysisCache:
+    """On-disk store of jedi results, keyed by project root, jedi version, file path and the
+    sha256 of the file's contents.
+
+    Entries are plain orjson data, so a cache file from an untrusted source can at worst be
+    ignored, never executed.
+
+    Not exact: a reference target can depend on other files (e.g. what a module re-exports),
+    and those are not part of the key. That's why indexing only uses a cache when asked to.
+    """
+
+    _connection: sqlite3.Connection
+    _project_root: str
+
+    def __init__(self, path: Path, project_root: Path) -> None:
+        self._connection = sqlite3.connect(str(path))
+        self._project_root = str(project_root)
+
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        if version != _SCHEMA_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS analyses")
+            self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " project_root TEXT NOT NULL, path TEXT NOT NULL, jedi_version TEXT NOT NULL, hash TEXT NOT NULL,"
+            " blob BLOB NOT NULL, PRIMARY KEY (project_root, path))"
+        )
+
+    def get(self, path: str, digest: str) -> Optional[FileAnalysis]:
+        row = self._connection.execute(
+            "SELECT blob FROM analyses WHERE project_root = ? AND path = ? AND jedi_version = ? AND hash = ?",
+            (self._project_root, path, jedi.__version__, digest),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            return _decode(path, row[0])
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+            # Not something we wrote; analyze the file again and overwrite it
+            return None
+
+    def put(self, digest: str, analysis: FileAnalysis) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO analyses (project_root, path, jedi_version, hash, blob) VALUES (?, ?, ?, ?, ?)",
+            (self._project_root, analysis.path, jedi.__version__, digest, _encode(analysis)),
+        )
+
+    def commit(self) -> None:
+        self._connection.commit()
+
+    def rollback(self) -> None:
+        self._connection.rollback()
+
+    def close(self) -> None:
+        self._connection.close()
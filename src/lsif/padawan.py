@@ -1,12 +1,34 @@
-from functools import cached_property
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List
+from typing import Optional
 
+from jedi.api import Project
+from jedi.api import Script
 from jedi.api.classes import Name
+from parso import python_bytes_to_unicode
+from parso import split_lines
 
 from lsif.types import Position
 from lsif.types import Range
 
 
-def _get_range(name: Name) -> Range:
+def _utf16_column(lines: List[str], line: int, column: int) -> int:
+    """Convert a jedi column (in code points) into UTF-16 code units, as LSIF expects.
+
+    Only characters outside the BMP differ, taking two code units instead of one.
+    """
+    if line > len(lines):
+        return column
+
+    prefix = lines[line - 1][:column]
+    if prefix.isascii():
+        return column
+
+    return column + sum(1 for char in prefix if ord(char) > 0xFFFF)
+
+
+def _get_range(name: Name, lines: List[str]) -> Range:
     starting_pos = name.get_definition_start_position()
     assert starting_pos
 
@@ -14,32 +36,68 @@ def _get_range(name: Name) -> Range:
     assert ending_pos
 
     return Range(
-        start=Position(line=starting_pos[0], character=starting_pos[1]),
-        end=Position(line=ending_pos[0], character=ending_pos[1]),
+        start=Position(line=starting_pos[0], character=_utf16_column(lines, *starting_pos)),
+        end=Position(line=ending_pos[0], character=_utf16_column(lines, *ending_pos)),
     )
 
 
+@dataclass(frozen=True)
 class Definition:
-    _name: Name
+    name: str
+    range: Range
+    docstring: str
 
-    def __init__(self, name: Name) -> None:
-        self._name = name
+    @classmethod
+    def from_name(cls, name: Name, lines: List[str]) -> "Definition":
+        return cls(name=name.full_name or name.name, range=_get_range(name, lines), docstring=name.docstring())
 
-    @cached_property
-    def range(self) -> Range:
-        return _get_range(self._name)
 
-    @cached_property
-    def docstring(self) -> str:
-        return self._name.docstring()
+@dataclass(frozen=True)
+class Reference:
+    range: Range
 
+    """ Full name of the first definition jedi resolves this reference to, if any. """
+    target: Optional[str]
+
+    @classmethod
+    def from_name(cls, name: Name, lines: List[str]) -> "Reference":
+        possible_definitions = name.goto(follow_imports=True)
+        target = possible_definitions[0].full_name if possible_definitions else None
+
+        return cls(range=_get_range(name, lines), target=target)
 
-class Reference:
-    _name: Name
 
-    def __init__(self, name: Name) -> None:
-        self._name = name
+@dataclass(frozen=True)
+class FileAnalysis:
+    """Everything the indexer needs from jedi for one file.
 
-    @cached_property
-    def range(self) -> Range:
-        return _get_range(self._name)
+    Only holds plain data, so it can be sent back from a worker process.
+    """
+
+    path: str
+    definitions: List[Definition]
+    references: List[Reference]
+
+
+@lru_cache(maxsize=None)
+def _get_project(project_root: str) -> Project:
+    # One per process, so jedi only discovers the project (and its sys.path) once
+    return Project(project_root)
+
+
+def analyze_file(path: str, project_root: str) -> FileAnalysis:
+    # Decode the source ourselves (the same way jedi does) so ranges can be mapped to utf-16
+    with open(path, "rb") as f:
+        code = python_bytes_to_unicode(f.read(), errors="replace")
+    lines = split_lines(code)
+
+    script = Script(code=code, path=path, project=_get_project(project_root))
+
+    definitions = script.get_names(all_scopes=True, definitions=True, references=False)
+    references = script.get_names(all_scopes=True, definitions=False, references=True)
+
+    return FileAnalysis(
+        path=path,
+        definitions=[Definition.from_name(name, lines) for name in definitions],
+        references=[Reference.from_name(name, lines) for name in references],
+    )
@@ -5,7 +5,7 @@ from typing import Protocol
 
 
 class Writer(Protocol):
-    def write(self, s: str) -> Any:
+    def write(self, s: bytes) -> Any:
         pass
 
 
@@ -0,0 +1,118 @@
+import shutil
+import sqlite3
+from pathlib import Path
+
+import orjson
+import pytest
+
+import lsif
+from lsif.cache import AnalysisCache
+from lsif.padawan import Definition
+from lsif.padawan import FileAnalysis
+from lsif.padawan import Reference
+from lsif.padawan import analyze_file
+from lsif.types import Position
+from lsif.types import Range
+from tests.utils import index_dump
+
+EXAMPLES = Path("./tests/examples/")
+
+
+def _analysis() -> FileAnalysis:
+    span = Range(start=Position(line=1, character=0), end=Position(line=1, character=3))
+    return FileAnalysis(
+        path="/project/a.py",
+        definitions=[Definition(name="a.foo", range=span, docstring="Foo.")],
+        references=[Reference(range=span, target="a.foo"), Reference(range=span, target=None)],
+    )
+
+
+def test_cache_round_trip(tmp_path):
+    analysis = _analysis()
+
+    cache = AnalysisCache(tmp_path / "cache.sqlite", Path("/project"))
+    cache.put("abc", analysis)
+    cache.commit()
+    cache.close()
+
+    cache = AnalysisCache(tmp_path / "cache.sqlite", Path("/project"))
+    assert cache.get("/project/a.py", "abc") == analysis
+    assert cache.get("/project/a.py", "changed") is None
+    assert cache.get("/project/b.py", "abc") is None
+    cache.close()
+
+    # Entries belong to the project root they were written for
+    cache = AnalysisCache(tmp_path / "cache.sqlite", Path("/other"))
+    assert cache.get("/project/a.py", "abc") is None
+    cache.close()
+
+
+def test_cache_ignores_entries_it_cannot_decode(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache.sqlite", Path("/project"))
+    cache.put("abc", _analysis())
+    cache.commit()
+    cache.close()
+
+    connection = sqlite3.connect(str(tmp_path / "cache.sqlite"))
+    connection.execute("UPDATE analyses SET blob = ?", (orjson.dumps({"definitions": [1]}),))
+    connection.commit()
+    connection.close()
+
+    cache = AnalysisCache(tmp_path / "cache.sqlite", Path("/project"))
+    assert cache.get("/project/a.py", "abc") is None
+    cache.close()
+
+
+def test_index_with_cache_matches_uncached_and_skips_jedi(tmp_path, monkeypatch):
+    cache_path = tmp_path / "cache.sqlite"
+
+    uncached = index_dump(EXAMPLES)
+    first = index_dump(EXAMPLES, cache_path=cache_path)
+
+    def fail(path: str, project_root: str) -> FileAnalysis:
+        raise AssertionError(f"jedi should not run for cached file {path}")
+
+    monkeypatch.setattr(lsif, "analyze_file", fail)
+    second = index_dump(EXAMPLES, cache_path=cache_path)
+
+    assert first == uncached
+    assert second == uncached
+
+
+def test_index_failure_leaves_cache_untouched(tmp_path, monkeypatch):
+    cache_path = tmp_path / "cache.sqlite"
+
+    def fail(self) -> bytes:
+        raise RuntimeError("serialization failed")
+
+    # Fails after the first file's analysis has already been put into the cache
+    monkeypatch.setattr(lsif.RangeNode, "serialize", fail)
+    with pytest.raises(RuntimeError):
+        index_dump(EXAMPLES, cache_path=cache_path)
+
+    connection = sqlite3.connect(str(cache_path))
+    assert connection.execute("SELECT COUNT(*) FROM analyses").fetchone() == (0,)
+    connection.close()
+
+
+def test_index_with_cache_reanalyzes_changed_files(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    shutil.copytree(EXAMPLES, project)
+    cache_path = tmp_path / "cache.sqlite"
+
+    index_dump(project, cache_path=cache_path)
+
+    changed = project / "simple" / "__init__.py"
+    changed.write_text(changed.read_text() + "\n\ndef added():\n    ...\n")
+
+    analyzed = []
+
+    def spy(path: str, project_root: str) -> FileAnalysis:
+        analyzed.append(path)
+        return analyze_file(path, project_root)
+
+    monkeypatch.setattr(lsif, "analyze_file", spy)
+    cached = index_dump(project, cache_path=cache_path)
+
+    assert analyzed == [str(changed.absolute())]
+    assert cached == index_dump(project)
@@ -1,5 +1,42 @@
+from pathlib import Path
+
 from lsif import __version__
+from lsif import _walk_py
+from tests.utils import index_dump
 
 
 def test_version():
     assert __version__ == '0.1.0'
+
+
+def test_walk_py_matches_glob():
+    root = Path("./tests/examples/")
+
+    assert sorted(_walk_py(str(root))) == sorted(str(p) for p in root.glob("**/*.py"))
+
+
+def test_index_process_pool_matches_in_process():
+    examples = Path("./tests/examples/")
+
+    # jedi has run in this process first, which used to break forked workers
+    in_process = index_dump(examples, jobs=1)
+    pooled = index_dump(examples, jobs=2)
+
+    assert pooled == in_process
+
+
+def test_index_shares_hover_results_between_equal_docstrings(tmp_path):
+    (tmp_path / "shared.py").write_text(
+        'class A:\n    def run(self):\n        """Runs."""\n\n\nclass B:\n    def run(self):\n        """Runs."""\n'
+    )
+
+    dump = index_dump(tmp_path)
+
+    runs = {"contents": ["run(self)\n\nRuns."]}
+    hover_results = [line for line in dump if line["label"] == "hoverResult" and line["result"] == runs]
+    assert len(hover_results) == 1
+
+    # Both A.run and B.run point their own result set at the one vertex
+    hover_id = hover_results[0]["id"]
+    hover_edges = [line for line in dump if line["label"] == "textDocument/hover" and line["inV"] == hover_id]
+    assert len({edge["outV"] for edge in hover_edges}) == len(hover_edges) == 2
@@ -1,4 +1,26 @@
+from pathlib import Path
+
+import orjson
+
+from lsif import BaseNode
+from lsif import ContainsNode
+from lsif import DefinitionResult
+from lsif import DocumentNode
+from lsif import HoverResult
+from lsif import ItemNode
 from lsif import MetadataNode
+from lsif import NextNode
+from lsif import ProjectNode
+from lsif import RangeNode
+from lsif import ReferenceResult
+from lsif import ResultSetNode
+from lsif import TextDocumentDefinitionNode
+from lsif import TextDocumentHoverNode
+from lsif import TextDocumentReferenceNode
+from lsif import VertexBase
+from lsif.padawan import Definition
+from lsif.types import Position
+from lsif.types import Range
 
 
 def test_metadata_node():
@@ -11,3 +33,95 @@ def test_metadata_node():
 
     assert d["label"] == mt.label
     assert d["version"] == mt.version
+
+
+def test_explicit_zero_id():
+    vertex = VertexBase(id=0)
+
+    assert vertex.id == 0
+
+
+def _concrete_node_classes(cls=BaseNode):
+    for subclass in cls.__subclasses__():
+        if "_TEMPLATE" in vars(subclass):
+            yield subclass
+        yield from _concrete_node_classes(subclass)
+
+
+def test_serialize_matches_dictionary():
+    document = DocumentNode(Path("./tests/examples/simple/__init__.py"))
+    span = Range(start=Position(line=1, character=2), end=Position(line=3, character=4))
+    range_node = RangeNode(range=span, document=document)
+
+    nodes = [
+        MetadataNode(projectRoot=Path("./")),
+        ProjectNode(),
+        document,
+        ResultSetNode(),
+        range_node,
+        HoverResult(definition=Definition(name="a.foo", range=span, docstring="Foo.")),
+        DefinitionResult(),
+        ReferenceResult(),
+        NextNode(inV=1, outV=2),
+        TextDocumentHoverNode(inV=1, outV=2),
+        TextDocumentDefinitionNode(inV=1, outV=2),
+        TextDocumentReferenceNode(inV=1, outV=2),
+        ItemNode(inVs=[range_node.id], outV=2, document=document),
+        ContainsNode(inVs=[1, 2, 3], outV=document.id),
+    ]
+
+    # Every class with a hand-written template has to be checked here
+    assert {type(node) for node in nodes} == set(_concrete_node_classes())
+
+    for node in nodes:
+        serialized = node.serialize()
+        assert serialized.endswith(b"\n")
+        assert orjson.loads(serialized) == orjson.loads(orjson.dumps(node.to_dictionary()))
+
+
+def test_range_node_positions_are_plain_dicts():
+    document = DocumentNode(Path("./tests/examples/simple/__init__.py"))
+    span = Range(start=Position(line=1, character=2), end=Position(line=3, character=4))
+
+    d = RangeNode(range=span, document=document).to_dictionary()
+
+    assert d["start"] == {"line": 1, "character": 2}
+    assert d["end"] == {"line": 3, "character": 4}
+    assert d["document"] == document.id
+
+
+def test_serialize_is_compact_utf8():
+    span = Range(start=Position(line=1, character=0), end=Position(line=1, character=3))
+    hover = HoverResult(definition=Definition(name="a.café", range=span, docstring="Crème brûlée"))
+
+    serialized = hover.serialize()
+
+    assert b" " not in serialized.replace("Crème brûlée".encode(), b"")
+    assert "Crème brûlée".encode() in serialized
+    assert orjson.loads(serialized)["result"] == {"contents": ["Crème brûlée"]}
+
+
+def test_emit_matches_serialize():
+    document = DocumentNode(Path("./tests/examples/simple/__init__.py"))
+
+    for emitted, node in [
+        (NextNode.emit(inV=1, outV=2), NextNode(inV=1, outV=2)),
+        (TextDocumentHoverNode.emit(inV=1, outV=2), TextDocumentHoverNode(inV=1, outV=2)),
+        (TextDocumentDefinitionNode.emit(inV=1, outV=2), TextDocumentDefinitionNode(inV=1, outV=2)),
+        (TextDocumentReferenceNode.emit(inV=1, outV=2), TextDocumentReferenceNode(inV=1, outV=2)),
+        (ItemNode.emit(inVs=[1], outV=2, document=document), ItemNode(inVs=[1], outV=2, document=document)),
+    ]:
+        emitted_dictionary = orjson.loads(emitted)
+        serialized_dictionary = orjson.loads(node.serialize())
+
+        # Both took a fresh id, the emitted one first
+        assert emitted_dictionary.pop("id") < serialized_dictionary.pop("id")
+        assert emitted_dictionary == serialized_dictionary
+
+
+def test_contains_node_large_in_vs():
+    in_vs = list(range(1, 20001))
+
+    serialized = ContainsNode(inVs=in_vs, outV=1).serialize()
+
+    assert orjson.loads(serialized)["inVs"] == in_vs
@@ -0,0 +1,13 @@
+from lsif.padawan import _utf16_column
+
+
+def test_utf16_column_ascii():
+    assert _utf16_column(["x = 1\n"], 1, 4) == 4
+
+
+def test_utf16_column_counts_surrogate_pairs():
+    lines = ['x = "\U0001F600"; y = x\n']
+
+    # Characters inside the BMP take a single code unit, the emoji takes two
+    assert _utf16_column(['é = 1\n'], 1, 2) == 2
+    assert _utf16_column(lines, 1, 13) == 14
@@ -0,0 +1,32 @@
+import io
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import orjson
+
+import lsif
+
+
+def index_dump(project: Path, jobs: Optional[int] = 1, cache_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    writer = io.BytesIO()
+    lsif.index(project, writer, jobs=jobs, cache_path=cache_path)
+
+    return renumber(writer.getvalue())
+
+
+def renumber(dump: bytes) -> List[Dict[str, Any]]:
+    """IDs keep counting up between runs, so compare dumps relative to their first id."""
+    lines = [orjson.loads(line) for line in dump.splitlines()]
+    first = min(line["id"] for line in lines if "id" in line)
+
+    for line in lines:
+        for key in ("id", "inV", "outV", "document"):
+            if key in line and isinstance(line[key], int):
+                line[key] -= first
+        if "inVs" in line:
+            line["inVs"] = [in_v - first for in_v in line["inVs"]]
+
+    return lines